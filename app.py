@@ -18,9 +18,13 @@ Notes
 from __future__ import annotations
 
 import argparse
+import os
+import re
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Optional, Tuple, List, Iterable
 from pathlib import Path
 
@@ -60,6 +64,18 @@ except Exception:
     cv2 = None  # type: ignore
     np = None  # type: ignore
 
+# Optional mss for fast screen capture (falls back to PyAutoGUI/PIL)
+try:
+    import mss  # type: ignore
+except Exception:
+    mss = None  # type: ignore
+
+# Optional Numba for JIT-compiling the point-dedup kernel
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None  # type: ignore
+
 # Supported image extensions for template files
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".gif"}
 
@@ -80,20 +96,41 @@ def parse_region(region_str: Optional[str]) -> Optional[Tuple[int, int, int, int
         sys.exit(2)
 
 
+# Active-window lookups go through the window system (FFI + syscall per call);
+# cache the verdict briefly since nobody switches windows faster than this.
+ACTIVE_WINDOW_TTL = 0.1
+_win_cache = {"ts": 0.0, "substr": None, "result": True}
+_title_pat = None  # compiled once per substring; avoids lowering the title
+
+
+def _title_pattern(substr: str):
+    global _title_pat
+    if _title_pat is None or _title_pat.pattern != re.escape(substr):
+        _title_pat = re.compile(re.escape(substr), re.IGNORECASE)
+    return _title_pat
+
+
 def active_window_matches(substr: Optional[str]) -> bool:
     if not substr:
         return True
     if gw is None:
         # If user requested window filtering but dependency missing, skip safely
         return True
+    now = time.monotonic()
+    if substr == _win_cache["substr"] and now - _win_cache["ts"] < ACTIVE_WINDOW_TTL:
+        return _win_cache["result"]
     try:
         win = gw.getActiveWindow()
         if not win:
-            return False
-        title = (win.title or "").lower()
-        return substr.lower() in title
+            result = False
+        else:
+            result = _title_pattern(substr).search(win.title or "") is not None
     except Exception:
-        return True
+        result = True
+    _win_cache["ts"] = now
+    _win_cache["substr"] = substr
+    _win_cache["result"] = result
+    return result
 
 
 def gather_image_templates(
@@ -129,32 +166,157 @@ def gather_image_templates(
     return templates
 
 
+if njit is not None and np is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _dedupe_points_nb(pts, min_dist):  # pragma: no cover
+        n = pts.shape[0]
+        keep = np.ones(n, dtype=np.bool_)
+        for i in range(n):
+            if not keep[i]:
+                continue
+            for j in range(i + 1, n):
+                if (
+                    keep[j]
+                    and abs(pts[i, 0] - pts[j, 0]) <= min_dist
+                    and abs(pts[i, 1] - pts[j, 1]) <= min_dist
+                ):
+                    keep[j] = False
+        return keep
+
+else:
+    _dedupe_points_nb = None  # type: ignore
+
+
+def warmup_dedupe_points() -> None:
+    """Trigger Numba compilation of the dedup kernel before the main loop."""
+    if _dedupe_points_nb is not None:
+        _dedupe_points_nb(np.zeros((2, 2), dtype=np.int64), 6)
+
+
 def dedupe_points(points: Iterable[Tuple[int, int]], min_dist: int = 6) -> List[Tuple[int, int]]:
     """Deduplicate points by skipping any that are within `min_dist` pixels of a prior point."""
-    kept: List[Tuple[int, int]] = []
-    for x, y in points:
-        too_close = False
-        for kx, ky in kept:
-            if abs(kx - x) <= min_dist and abs(ky - y) <= min_dist:
-                too_close = True
-                break
-        if not too_close:
-            kept.append((x, y))
-    return kept
+    pts_list = list(points)
+    if np is None:
+        # Pure-Python fallback when NumPy is unavailable
+        kept: List[Tuple[int, int]] = []
+        for x, y in pts_list:
+            too_close = False
+            for kx, ky in kept:
+                if abs(kx - x) <= min_dist and abs(ky - y) <= min_dist:
+                    too_close = True
+                    break
+            if not too_close:
+                kept.append((x, y))
+        return kept
+    if not pts_list:
+        return []
+    pts = np.asarray(pts_list, dtype=np.int64)
+    if _dedupe_points_nb is not None:
+        keep = _dedupe_points_nb(pts, min_dist)
+        return [(int(x), int(y)) for x, y in pts[keep]]
+    # Broadcast the pairwise Chebyshev distances once, then do a greedy scan
+    # that suppresses each kept point's neighbors in bulk instead of an O(n^2)
+    # Python double loop.
+    close = np.abs(pts[:, None, :] - pts[None, :, :]).max(-1) <= min_dist
+    keep = np.ones(len(pts), dtype=bool)
+    for i in range(len(pts)):
+        if keep[i]:
+            keep[i + 1 :] &= ~close[i, i + 1 :]
+    return [(int(x), int(y)) for x, y in pts[keep]]
+
+
+# One mss instance reused across iterations; re-creating the grabber every
+# capture costs a display-server handshake per frame.
+_sct = None
+
+
+def _screen_grabber():
+    global _sct
+    if _sct is None and mss is not None:
+        try:
+            _sct = mss.mss()
+        except Exception:
+            return None
+    return _sct
+
 
+def screenshot_gray(region: Optional[Tuple[int, int, int, int]] = None):
+    """Capture the screen (or region) and return as a grayscale numpy array.
 
-def screenshot_bgr(region: Optional[Tuple[int, int, int, int]] = None):
-    """Capture the screen (or region) and return as a BGR numpy array for OpenCV."""
+    Prefers mss, which hands back raw BGRA straight from the OS compositor and
+    is much faster than PyAutoGUI's PIL-based grab. Single-channel matching is
+    just as reliable for UI buttons and cuts the NCC work threefold.
+    """
+    global _sct
     if cv2 is None or np is None:
         return None
+    sct = _screen_grabber()
+    if sct is not None:
+        try:
+            if region:
+                l, t, w, h = region
+                mon = {"left": l, "top": t, "width": w, "height": h}
+            else:
+                # Primary monitor (monitors[0] is the all-monitors virtual
+                # box, whose origin can be negative on multi-monitor setups
+                # and would skew click coordinates); this also matches the
+                # PIL fallback below.
+                mon = sct.monitors[1]
+            shot = sct.grab(mon)
+            # Use the raw BGRA buffer directly; shot.rgb would pay for a
+            # slow per-pixel conversion in Python.
+            bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+                shot.height, shot.width, 4
+            )
+            # Green channel as the grayscale proxy: extractChannel is a pure
+            # SIMD shuffle (one pass, no weighted arithmetic), and matching
+            # stays consistent because templates use the same channel.
+            return cv2.extractChannel(bgra, 1)
+        except Exception:
+            _sct = None  # stale handle; rebuild next call, use PIL this one
     img = pg.screenshot(region=region)
     arr = np.array(img)  # RGB
-    bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-    return bgr
+    return cv2.extractChannel(arr, 1)
+
+
+# OpenCL transparent-API dispatch: wrapping inputs in cv2.UMat lets OpenCV
+# route matchTemplate to its OpenCL (or widest-SIMD) kernels at runtime.
+_use_opencl = None
+
+
+def _opencl_enabled() -> bool:
+    global _use_opencl
+    if _use_opencl is None:
+        try:
+            _use_opencl = bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+        except Exception:
+            _use_opencl = False
+    return _use_opencl
+
+
+# Multi-scale matching: levels beyond 0 are pyrDown'd halvings. Coarse levels
+# use a relaxed threshold so borderline matches are not lost before refinement.
+PYR_MAX_LEVELS = 2
+PYR_MIN_SIDE = 12
+PYR_MARGIN = 0.05
+
+
+def build_pyramid(img, levels: int):
+    """Return [img, pyrDown(img), ...] with `levels` extra halved levels."""
+    pyr = [img]
+    for _ in range(levels):
+        pyr.append(cv2.pyrDown(pyr[-1]))
+    return pyr
 
 
 def load_templates_cv(paths: List[str]):
-    """Load template images as BGR arrays with metadata for matching."""
+    """Load template images as grayscale arrays with metadata for matching.
+
+    Each template carries a small Gaussian pyramid so matching can start at a
+    coarse scale (1/16th the pixels at level 2) and refine only around
+    promising candidates.
+    """
     if cv2 is None:
         return None
     templates = []
@@ -163,69 +325,346 @@ def load_templates_cv(paths: List[str]):
             t = cv2.imread(p, cv2.IMREAD_COLOR)
             if t is None:
                 continue
+            t = cv2.extractChannel(t, 1)  # same green-channel proxy as capture
             h, w = t.shape[:2]
-            templates.append({"path": p, "name": Path(p).name, "img": t, "w": w, "h": h})
+            levels = 0
+            while levels < PYR_MAX_LEVELS and min(h, w) >> (levels + 1) >= PYR_MIN_SIDE:
+                levels += 1
+            pyr = build_pyramid(t, levels)
+            entry = {
+                "path": p,
+                "name": Path(p).name,
+                "img": t,
+                "pyr": pyr,
+                "w": w,
+                "h": h,
+                "hits": 1.0,  # decayed hit rate; drives template ordering
+            }
+            if _opencl_enabled():
+                entry["upyr"] = [cv2.UMat(lvl) for lvl in pyr]
+            templates.append(entry)
         except Exception:
             continue
     return templates
 
 
+def changed_region(prev, cur, pad: int):
+    """Bounding box of pixels that differ between two same-shape frames.
+
+    Returns None when the frames are identical, otherwise (x0, y0, x1, y1)
+    expanded by `pad` on every side and clamped to the frame.
+    """
+    diff = cv2.absdiff(prev, cur)
+    pts = cv2.findNonZero(diff)
+    if pts is None:
+        return None
+    x, y, w, h = cv2.boundingRect(pts)
+    fh, fw = cur.shape[:2]
+    return (
+        max(0, x - pad),
+        max(0, y - pad),
+        min(fw, x + w + pad),
+        min(fh, y + h + pad),
+    )
+
+
+def init_gpu_matching(templates):
+    """Create a CUDA template matcher and upload templates to the GPU.
+
+    Returns the matcher, or None when OpenCV has no usable CUDA device (the
+    caller then stays on the CPU path). Uploaded GpuMats are stored on each
+    template dict under "gpu" so they stay resident across frames.
+    """
+    if cv2 is None or not hasattr(cv2, "cuda") or not templates:
+        return None
+    try:
+        if cv2.cuda.getCudaEnabledDeviceCount() < 1:
+            return None
+        # Same method as the CPU path so --confidence means the same thing
+        # on both backends.
+        matcher = cv2.cuda.createTemplateMatching(cv2.CV_8U, cv2.TM_SQDIFF_NORMED)
+        for t in templates:
+            gm = cv2.cuda_GpuMat()
+            gm.upload(t["img"])
+            t["gpu"] = gm
+        return matcher
+    except Exception:
+        return None
+
+
+def _match_one_template_gpu(gpu_scr, t, confidence: float, matcher) -> List[Tuple[int, int, float]]:
+    """Full-resolution GPU match for a single template.
+
+    The correlation runs on the device; only the small response map is
+    downloaded for peak extraction. The TM_SQDIFF_NORMED response is
+    inverted like on the CPU path so scores stay higher-is-better.
+    """
+    try:
+        res = 1.0 - matcher.match(gpu_scr, t["gpu"]).download()
+    except Exception:
+        return []
+    tw, th = t["w"], t["h"]
+    kernel = np.ones((max(3, th // 2), max(3, tw // 2)), np.uint8)
+    mask = (res >= confidence) & (res == cv2.dilate(res, kernel))
+    ys, xs = np.nonzero(mask)
+    return list(zip(xs.tolist(), ys.tolist(), res[ys, xs].tolist()))
+
+
+# Worker pool for matching templates concurrently; matchTemplate releases the
+# GIL, so plain threads scale across cores here.
+_match_pool = None
+
+
+def _get_match_pool():
+    global _match_pool
+    if _match_pool is None:
+        _match_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _match_pool
+
+
+def _coarse_level(scr_pyr, t) -> int:
+    """Pick the coarsest pyramid level where the screen still contains `t`."""
+    lvl = len(t["pyr"]) - 1
+    while lvl > 0 and (
+        scr_pyr[lvl].shape[0] < t["pyr"][lvl].shape[0]
+        or scr_pyr[lvl].shape[1] < t["pyr"][lvl].shape[1]
+    ):
+        lvl -= 1
+    return lvl
+
+
+def _match_one_template(scr_pyr, t, confidence: float, scr_upyr=None) -> List[Tuple[int, int, float]]:
+    """Run coarse-to-fine matching for a single template.
+
+    `scr_upyr` optionally holds per-level UMat wraps of the screen pyramid,
+    shared across templates so the frame is uploaded once, not per worker.
+    Returns kept (x, y, score) candidates in full-resolution screen-local
+    coordinates.
+    """
+    lvl = _coarse_level(scr_pyr, t)
+    tmpl = t["pyr"][lvl]
+    tw, th = tmpl.shape[1], tmpl.shape[0]
+    res = None
+    if "upyr" in t and scr_upyr is not None and scr_upyr[lvl] is not None:
+        try:
+            # T-API: UMat inputs let OpenCV dispatch this to its OpenCL
+            # kernels; only the small response map is pulled back.
+            res = 1.0 - cv2.matchTemplate(
+                scr_upyr[lvl], t["upyr"][lvl], cv2.TM_SQDIFF_NORMED
+            ).get()
+        except Exception:
+            res = None
+    if res is None:
+        try:
+            # TM_SQDIFF_NORMED keeps the uint8 inputs on OpenCV's integer SIMD
+            # path, roughly halving memory traffic versus the float32 promotion
+            # TM_CCOEFF_NORMED does. Keep screen and templates uint8 end to
+            # end: matchTemplate only accepts CV_8U/CV_32F, and one byte per
+            # pixel already undercuts even fp16 storage for bandwidth.
+            # matchTemplate still dispatches internally to DFT-based
+            # cross-correlation once the template is large enough, so big
+            # templates get the O(W*H*log) path without an explicit branch.
+            # Invert so downstream logic keeps "higher is better" scores.
+            res = 1.0 - cv2.matchTemplate(scr_pyr[lvl], tmpl, cv2.TM_SQDIFF_NORMED)
+        except Exception:
+            return []
+    threshold = confidence if lvl == 0 else confidence - PYR_MARGIN
+    # Keep only local maxima: a pixel that equals its dilated neighborhood
+    # is the peak of its match blob, so no Python-side NMS pass is needed.
+    kernel = np.ones((max(3, th // 2), max(3, tw // 2)), np.uint8)
+    mask = (res >= threshold) & (res == cv2.dilate(res, kernel))
+    ys, xs = np.nonzero(mask)
+    # One fancy-indexing gather for all scores instead of a Python-level
+    # res[y, x] lookup per candidate.
+    coarse = list(zip(xs.tolist(), ys.tolist(), res[ys, xs].tolist()))
+
+    # Refine each surviving candidate down the pyramid inside a small ROI
+    kept: List[Tuple[int, int, float]] = []
+    for x, y, s in coarse:
+        ok = True
+        for l in range(lvl - 1, -1, -1):
+            lt = t["pyr"][l]
+            lth, ltw = lt.shape[:2]
+            k = 4
+            x0 = max(0, 2 * x - k)
+            y0 = max(0, 2 * y - k)
+            roi = scr_pyr[l][y0 : y0 + lth + 2 * k, x0 : x0 + ltw + 2 * k]
+            if roi.shape[0] < lth or roi.shape[1] < ltw:
+                ok = False
+                break
+            r = cv2.matchTemplate(roi, lt, cv2.TM_SQDIFF_NORMED)
+            minv, _, minloc, _ = cv2.minMaxLoc(r)
+            x, y, s = x0 + minloc[0], y0 + minloc[1], 1.0 - float(minv)
+        if ok and s >= confidence:
+            kept.append((x, y, s))
+    return kept
+
+
+@dataclass
+class MatchResults:
+    """Match hits in column (struct-of-arrays) form; row i of every field
+    describes one hit. Numeric columns are NumPy arrays so thresholding,
+    sorting and coordinate math stay vectorized end to end."""
+
+    names: List[str]
+    paths: List[str]
+    x: "np.ndarray"
+    y: "np.ndarray"
+    cx: "np.ndarray"
+    cy: "np.ndarray"
+    w: "np.ndarray"
+    h: "np.ndarray"
+    score: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def empty(cls) -> "MatchResults":
+        z = np.empty(0, dtype=np.int64) if np is not None else []
+        return cls([], [], z, z, z, z, z, z, z)
+
+    def select(self, mask) -> "MatchResults":
+        idx = np.nonzero(mask)[0]
+        rows = idx.tolist()
+        return MatchResults(
+            [self.names[i] for i in rows],
+            [self.paths[i] for i in rows],
+            self.x[idx],
+            self.y[idx],
+            self.cx[idx],
+            self.cy[idx],
+            self.w[idx],
+            self.h[idx],
+            self.score[idx],
+        )
+
+    @classmethod
+    def concat(cls, a: "MatchResults", b: "MatchResults") -> "MatchResults":
+        return cls(
+            a.names + b.names,
+            a.paths + b.paths,
+            np.concatenate([a.x, b.x]),
+            np.concatenate([a.y, b.y]),
+            np.concatenate([a.cx, b.cx]),
+            np.concatenate([a.cy, b.cy]),
+            np.concatenate([a.w, b.w]),
+            np.concatenate([a.h, b.h]),
+            np.concatenate([a.score, b.score]),
+        )
+
+
 def match_all_templates_cv(
-    screen_bgr,
+    screen_gray,
     templates,
     confidence: float,
     region_offset: Tuple[int, int] = (0, 0),
-):
+    gpu_matcher=None,
+) -> "MatchResults":
     """Match all templates on the provided screenshot.
 
-    Returns a list of dicts: {name, path, x, y, cx, cy, w, h, score}
-    Coordinates are absolute screen coordinates, accounting for region offset.
+    Returns a MatchResults with absolute screen coordinates, accounting for
+    the region offset.
     """
-    if cv2 is None or np is None or screen_bgr is None or not templates:
-        return []
-    results = []
-    for t in templates:
-        tmpl = t["img"]
-        w, h = t["w"], t["h"]
-        try:
-            res = cv2.matchTemplate(screen_bgr, tmpl, cv2.TM_CCOEFF_NORMED)
-        except Exception:
-            continue
-        loc = np.where(res >= confidence)
-        ys, xs = loc[0], loc[1]
-        candidates = [
-            (int(x), int(y), float(res[y, x]))
-            for x, y in zip(xs.tolist(), ys.tolist())
+    if cv2 is None or np is None or screen_gray is None or not templates:
+        return MatchResults.empty()
+    if gpu_matcher is not None:
+        # One upload per frame; templates are already resident on the device.
+        gpu_scr = cv2.cuda_GpuMat()
+        gpu_scr.upload(screen_gray)
+        kept_lists = [
+            _match_one_template_gpu(gpu_scr, t, confidence, gpu_matcher)
+            for t in templates
         ]
-        candidates.sort(key=lambda k: k[2], reverse=True)
-        kept: List[Tuple[int, int, float]] = []
-        for x, y, s in candidates:
-            too_close = False
-            for kx, ky, _ in kept:
-                if abs(kx - x) <= max(6, w // 4) and abs(ky - y) <= max(6, h // 4):
-                    too_close = True
-                    break
-            if not too_close:
-                kept.append((x, y, s))
-
-        offx, offy = region_offset
-        for x, y, s in kept:
-            cx = x + w // 2 + offx
-            cy = y + h // 2 + offy
-            results.append(
-                {
-                    "name": t["name"],
-                    "path": t["path"],
-                    "x": x + offx,
-                    "y": y + offy,
-                    "cx": cx,
-                    "cy": cy,
-                    "w": w,
-                    "h": h,
-                    "score": s,
-                }
+    else:
+        scr_pyr = build_pyramid(
+            screen_gray, max(len(t["pyr"]) for t in templates) - 1
+        )
+        # Wrap each coarse level actually in use as UMat once per frame, so
+        # the screen is uploaded to the OpenCL device once rather than by
+        # every pool worker (mirroring the CUDA path's single upload).
+        scr_upyr = None
+        if any("upyr" in t for t in templates):
+            scr_upyr = [None] * len(scr_pyr)
+            for t in templates:
+                if "upyr" not in t:
+                    continue
+                lvl = _coarse_level(scr_pyr, t)
+                if scr_upyr[lvl] is None:
+                    try:
+                        scr_upyr[lvl] = cv2.UMat(scr_pyr[lvl])
+                    except Exception:
+                        pass  # workers fall back to the ndarray call
+        if len(templates) > 1:
+            kept_lists = list(
+                _get_match_pool().map(
+                    lambda t: _match_one_template(scr_pyr, t, confidence, scr_upyr),
+                    templates,
+                )
             )
-    return results
+        else:
+            kept_lists = [
+                _match_one_template(scr_pyr, templates[0], confidence, scr_upyr)
+            ]
+
+    # Update the decayed hit rate that drives template ordering
+    for t, kept in zip(templates, kept_lists):
+        t["hits"] = t["hits"] * 0.9 + (1.0 if kept else 0.0)
+
+    # Accumulate per-template column chunks and concatenate once; offset and
+    # center arithmetic are whole-column adds on the final arrays.
+    names: List[str] = []
+    paths: List[str] = []
+    x_c, y_c, w_c, h_c, s_c = [], [], [], [], []
+    for t, kept in zip(templates, kept_lists):
+        if not kept:
+            continue
+        n = len(kept)
+        ka = np.asarray(kept)
+        names.extend([t["name"]] * n)
+        paths.extend([t["path"]] * n)
+        x_c.append(ka[:, 0].astype(np.int64))
+        y_c.append(ka[:, 1].astype(np.int64))
+        w_c.append(np.full(n, t["w"], dtype=np.int64))
+        h_c.append(np.full(n, t["h"], dtype=np.int64))
+        s_c.append(ka[:, 2])
+    if not names:
+        return MatchResults.empty()
+    offx, offy = region_offset
+    xs = np.concatenate(x_c) + offx
+    ys = np.concatenate(y_c) + offy
+    ws = np.concatenate(w_c)
+    hs = np.concatenate(h_c)
+    return MatchResults(
+        names, paths, xs, ys, xs + ws // 2, ys + hs // 2, ws, hs, np.concatenate(s_c)
+    )
+
+
+def warmup_matching(cv_templates, region, gpu_matcher=None) -> None:
+    """Run one throwaway match on a black frame of the real capture size.
+
+    First calls into OpenCV (kernel selection, OpenCL program build, thread
+    pool spin-up) can cost an order of magnitude more than steady state; pay
+    that before the loop so the first real frame is not a latency outlier.
+    """
+    if cv2 is None or np is None or not cv_templates:
+        return
+    if region:
+        w, h = region[2], region[3]
+    else:
+        try:
+            w, h = pg.size()
+        except Exception:
+            w, h = 1280, 720
+    try:
+        match_all_templates_cv(
+            np.zeros((int(h), int(w)), dtype=np.uint8),
+            cv_templates,
+            confidence=0.99,
+            gpu_matcher=gpu_matcher,
+        )
+    except Exception:
+        pass
 
 
 def main():
@@ -233,7 +672,7 @@ def main():
     parser.add_argument("--image", "-i", default="approve.png", help="Path to a template image to find (also scans --images-dir)")
     parser.add_argument("--images-dir", default="images", help="Directory of images to scan and click when matched")
     parser.add_argument("--no-images-dir", action="store_true", help="Do not scan --images-dir; only use --image")
-    parser.add_argument("--confidence", "-c", type=float, default=0.80, help="Match confidence [0.0-1.0] (needs OpenCV)")
+    parser.add_argument("--confidence", "-c", type=float, default=0.80, help="Match confidence [0.0-1.0]; compared against 1 - normalized squared difference (needs OpenCV)")
     parser.add_argument("--interval", type=float, default=0.2, help="Search interval in seconds")
     parser.add_argument("--pre-click-delay", type=float, default=0.0, help="Delay before clicking, in seconds")
     parser.add_argument("--after-click", type=float, default=0.5, help="Sleep after clicking, in seconds")
@@ -246,6 +685,7 @@ def main():
     parser.add_argument("--no-detect-timeout", type=float, default=1800.0, help="Auto-stop if no detection for N seconds (0 disables)")
     parser.add_argument("--no-restore-pointer", action="store_true", help="Do not restore mouse to original position after clicking")
     parser.add_argument("--restore-duration", type=float, default=0.0, help="Seconds to animate pointer restore (0 = instant)")
+    parser.add_argument("--gpu", action="store_true", help="Run template matching on the GPU (needs CUDA-enabled OpenCV)")
     parser.add_argument("--debug", action="store_true", help="Verbose errors and state changes")
 
     args = parser.parse_args()
@@ -256,12 +696,16 @@ def main():
     pg.FAILSAFE = True
     pg.PAUSE = 0.05
 
-    running = {"value": True}
+    running_evt = threading.Event()
+    running_evt.set()
     exit_evt = threading.Event()
 
     def toggle():
-        running["value"] = not running["value"]
-        print(f"Auto-Approve {'resumed' if running['value'] else 'paused'}.")
+        if running_evt.is_set():
+            running_evt.clear()
+        else:
+            running_evt.set()
+        print(f"Auto-Approve {'resumed' if running_evt.is_set() else 'paused'}.")
 
     def quit_program():
         print("Quit requested. Exiting...")
@@ -313,11 +757,39 @@ def main():
         if sp.suffix.lower() in IMAGE_EXTS and not sp.is_file():
             print(f"Warning: template not found, skipping: {args.image}")
 
+    # Decode templates once, up front; the loop only consumes them
+    cv_templates = None
+    if cv2 is not None and np is not None and templates:
+        cv_templates = load_templates_cv(templates)
+
+    gpu_matcher = None
+    if args.gpu:
+        gpu_matcher = init_gpu_matching(cv_templates)
+        if gpu_matcher is not None:
+            print("- GPU template matching enabled (CUDA)")
+        else:
+            print("Warning: --gpu requested but no CUDA-enabled OpenCV device found; using CPU.")
+
+    # Pay one-time costs (Numba compile, OpenCV kernel/OpenCL setup) up front
+    warmup_dedupe_points()
+    warmup_matching(cv_templates, region, gpu_matcher)
+
     last_error_ts = 0.0
     last_detection_ts = time.time()
 
+    # Frame-difference cache: skip template matching when the screen is unchanged
+    prev_scr = None
+    cached_matches: Optional[MatchResults] = None
+    cache_key = None  # invalidates cache if region/confidence ever change
+
+    # Adaptive polling: back off while nothing matches, snap back on a hit
+    cur_interval = args.interval
+    max_interval = max(2.0, args.interval)
+
+    frame_count = 0
+
     while not exit_evt.is_set():
-        if running["value"]:
+        if running_evt.is_set():
             # Auto-stop if no detection within timeout window
             if args.no_detect_timeout and args.no_detect_timeout > 0:
                 if (time.time() - last_detection_ts) > args.no_detect_timeout:
@@ -326,35 +798,86 @@ def main():
                     break
             try:
                 if not active_window_matches(args.window_title):
-                    time.sleep(args.interval)
+                    exit_evt.wait(cur_interval)
                     continue
 
                 # Accumulate all hit centers this iteration (dedup close points)
                 hit_points: List[Tuple[int, int]] = []
                 printed_any = False
-                if cv2 is not None and np is not None and templates:
-                    # Preload templates once if available
-                    try:
-                        cv_templates
-                    except NameError:
-                        cv_templates = None  # type: ignore
-                    if not cv_templates:
-                        cv_templates = load_templates_cv(templates)
+                if cv_templates:
                     # Capture screenshot once per loop
                     offx, offy = 0, 0
                     if region:
                         offx, offy, _, _ = region
-                    scr = screenshot_bgr(region=region)
-                    matches = match_all_templates_cv(
-                        screen_bgr=scr,
-                        templates=cv_templates,
-                        confidence=args.confidence,
-                        region_offset=(offx, offy),
+                    scr = screenshot_gray(region=region)
+                    # Frame differencing: reuse cached matches when nothing
+                    # changed, and re-match only the changed strip (padded by
+                    # the largest template) when the change is localized. Only
+                    # a big change forces a full-screen pass.
+                    key = (region, args.confidence)
+                    cache_ok = (
+                        scr is not None
+                        and prev_scr is not None
+                        and cached_matches is not None
+                        and key == cache_key
+                        and scr.shape == prev_scr.shape
                     )
-                    for m in matches:
-                        print(f"Match: {m['name']} @ ({m['cx']},{m['cy']}) score={m['score']:.3f}")
+                    roi = None
+                    if cache_ok:
+                        pad = max(max(t["w"], t["h"]) for t in cv_templates)
+                        roi = changed_region(prev_scr, scr, pad)
+                    if cache_ok and roi is None:
+                        matches = cached_matches
+                    elif cache_ok and (roi[2] - roi[0]) * (roi[3] - roi[1]) <= (
+                        scr.shape[0] * scr.shape[1] // 2
+                    ):
+                        x0, y0, x1, y1 = roi
+                        roi_matches = match_all_templates_cv(
+                            screen_gray=np.ascontiguousarray(scr[y0:y1, x0:x1]),
+                            templates=cv_templates,
+                            confidence=args.confidence,
+                            region_offset=(offx + x0, offy + y0),
+                            gpu_matcher=gpu_matcher,
+                        )
+                        # Cached hits whose centers fall outside the ROI are
+                        # still valid; union them with the fresh ROI results.
+                        outside = ~(
+                            (cached_matches.cx >= offx + x0)
+                            & (cached_matches.cx < offx + x1)
+                            & (cached_matches.cy >= offy + y0)
+                            & (cached_matches.cy < offy + y1)
+                        )
+                        matches = MatchResults.concat(
+                            cached_matches.select(outside), roi_matches
+                        )
+                        cached_matches = matches
+                        cache_key = key
+                    else:
+                        matches = match_all_templates_cv(
+                            screen_gray=scr,
+                            templates=cv_templates,
+                            confidence=args.confidence,
+                            region_offset=(offx, offy),
+                            gpu_matcher=gpu_matcher,
+                        )
+                        cached_matches = matches
+                        cache_key = key
+                    prev_scr = scr
+                    # Periodically put frequently-hitting templates first so
+                    # the pool schedules the likely (and usually heavier)
+                    # matches before the long tail of misses.
+                    frame_count += 1
+                    if frame_count % 50 == 0:
+                        cv_templates.sort(key=lambda t: t["hits"], reverse=True)
+                    for name, mcx, mcy, score in zip(
+                        matches.names,
+                        matches.cx.tolist(),
+                        matches.cy.tolist(),
+                        matches.score.tolist(),
+                    ):
+                        print(f"Match: {name} @ ({mcx},{mcy}) score={score:.3f}")
                         printed_any = True
-                        hit_points.append((m["cx"], m["cy"]))
+                        hit_points.append((mcx, mcy))
                 else:
                     for tmpl in templates:
                         try:
@@ -380,6 +903,12 @@ def main():
                 # Deduplicate near-overlapping points (e.g., similar templates)
                 hit_points = dedupe_points(hit_points, min_dist=6)
 
+                # Back off while idle, snap back to the base rate on a hit
+                if hit_points:
+                    cur_interval = args.interval
+                else:
+                    cur_interval = min(cur_interval * 1.5, max_interval)
+
                 for (x, y) in hit_points:
                     orig_x, orig_y = pg.position()
                     if args.pre_click_delay > 0:
@@ -405,7 +934,8 @@ def main():
                 if args.debug or (now - last_error_ts) > 5.0:
                     print(f"Warning: locate/click error: {e.__class__.__name__}: {e}")
                     last_error_ts = now
-        time.sleep(args.interval)
+        # Event wait instead of sleep so the quit hotkey wakes the loop at once
+        exit_evt.wait(cur_interval)
 
 
 if __name__ == "__main__":